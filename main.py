@@ -1,276 +1,374 @@
-import streamlit as st
-import pandas as pd
-import os
-from datetime import datetime
-import json # Needed for handling chat data if saving to CSV (though not fully implemented here)
-
-# --- Configuration ---
-UPLOAD_DIR = "uploaded_work_samples" # Directory to save uploaded files
-SUBMISSIONS_FILE = "submissions.csv" # File to store submission records
-
-# --- Helper Functions ---
-
-def initialize_app():
-    """Initializes the application state and necessary directories/files."""
-    if not os.path.exists(UPLOAD_DIR):
-        try:
-            os.makedirs(UPLOAD_DIR)
-        except OSError as e:
-            st.error(f"Error creating upload directory: {e}")
-            st.stop()
-
-    if 'submissions_df' not in st.session_state:
-        try:
-            st.session_state.submissions_df = pd.read_csv(SUBMISSIONS_FILE)
-            # Convert Timestamp column to datetime
-            if 'Timestamp' in st.session_state.submissions_df.columns:
-                st.session_state.submissions_df['Timestamp'] = pd.to_datetime(st.session_state.submissions_df['Timestamp'])
-            
-            # Ensure 'Chat' column exists and contains lists (handle potential loading issues)
-            if 'Chat' not in st.session_state.submissions_df.columns:
-                 st.session_state.submissions_df['Chat'] = [[] for _ in range(len(st.session_state.submissions_df))]
-            else:
-                 # Attempt to safely convert string representation back to list if needed
-                 # This is fragile; proper serialization (like JSON) is better for file storage.
-                 st.session_state.submissions_df['Chat'] = st.session_state.submissions_df['Chat'].apply(
-                     lambda x: json.loads(x) if isinstance(x, str) and x.startswith('[') else x if isinstance(x, list) else []
-                 )
-
-        except FileNotFoundError:
-            st.session_state.submissions_df = pd.DataFrame(columns=[
-                "Timestamp", "Learner Name", "Module/Task", "Filename", "File Path", "Status", "Chat"
-            ])
-        except (pd.errors.EmptyDataError, KeyError, json.JSONDecodeError) as e:
-             st.warning(f"Issue loading submissions or chat history ({e}), initializing fresh state.")
-             st.session_state.submissions_df = pd.DataFrame(columns=[
-                "Timestamp", "Learner Name", "Module/Task", "Filename", "File Path", "Status", "Chat"
-            ])
-        except Exception as e:
-            st.error(f"Error loading submissions file: {e}")
-            st.session_state.submissions_df = pd.DataFrame(columns=[
-                "Timestamp", "Learner Name", "Module/Task", "Filename", "File Path", "Status", "Chat"
-            ])
-
-        # Ensure Chat column always contains lists after loading or initialization
-        st.session_state.submissions_df['Chat'] = st.session_state.submissions_df['Chat'].apply(lambda x: x if isinstance(x, list) else [])
-
-
-def save_submission_record(df):
-    """Saves the submission DataFrame (excluding chat for CSV simplicity) to CSV."""
-    try:
-        # Create a copy excluding the 'Chat' column before saving to CSV
-        df_to_save = df.drop(columns=['Chat'], errors='ignore')
-        df_to_save.to_csv(SUBMISSIONS_FILE, index=False)
-    except Exception as e:
-        st.error(f"Error saving submission record to CSV: {e}")
-
-def add_submission_to_state(timestamp, learner_name, module_task, filename, file_path, status="Submitted"):
-    """Adds a new submission to the session state DataFrame."""
-    new_submission = pd.DataFrame([{
-        "Timestamp": timestamp,
-        "Learner Name": learner_name,
-        "Module/Task": module_task,
-        "Filename": filename,
-        "File Path": file_path,
-        "Status": status,
-        "Chat": [] # Initialize chat history as an empty list
-    }])
-    st.session_state.submissions_df = pd.concat(
-        [st.session_state.submissions_df, new_submission],
-        ignore_index=True
-    )
-    # Save the updated records (without chat) to CSV
-    save_submission_record(st.session_state.submissions_df)
-
-
-def add_chat_message(submission_index, author, message):
-    """Adds a chat message to a specific submission in the session state."""
-    if submission_index is not None and submission_index in st.session_state.submissions_df.index:
-        message_entry = {
-            "author": author,
-            "message": message,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        # Append message to the list in the DataFrame cell
-        st.session_state.submissions_df.loc[submission_index, 'Chat'].append(message_entry)
-        # This change is only in session state, not saved to CSV by default.
-    else:
-        st.error("Could not add chat message: Invalid submission index.")
-
-
-# --- Streamlit App UI ---
-
-st.set_page_config(layout="wide")
-st.title("🎓 Work Sample Submission Portal")
-st.markdown("Upload your work samples here for progress verification.")
-
-initialize_app()
-
-# --- Submission Form ---
-st.header("Submit Your Work")
-with st.form("submission_form", clear_on_submit=True):
-    learner_name = st.text_input("Enter Your Name:")
-    available_modules = [
-        "Module 1: Basic Wood Carving Techniques", "Module 2: Introduction to Pottery Wheel",
-        "Task 3.1: Soldering Practice", "Project Alpha: Weaving Pattern Design",
-        "Cultural Practice: Traditional Knot Tying - Step 1", "Other"
-    ]
-    selected_module_option = st.selectbox("Select the Module/Task:", available_modules)
-    custom_module = ""
-    if selected_module_option == "Other":
-        custom_module = st.text_input("Please specify the Module/Task:")
-
-    uploaded_file = st.file_uploader(
-        "Upload your work sample (Image, Video, PDF, etc.):",
-        type=None
-    )
-    submitted = st.form_submit_button("Submit Work Sample")
-
-    if submitted:
-        final_module = custom_module if selected_module_option == "Other" else selected_module_option
-        if not learner_name:
-            st.warning("Please enter your name.")
-        elif not final_module:
-            st.warning("Please select or specify the module/task.")
-        elif uploaded_file is None:
-            st.warning("Please upload a file.")
-        else:
-            try:
-                timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_learner_name = "".join(c if c.isalnum() else "_" for c in learner_name)
-                safe_module_name = "".join(c if c.isalnum() else "_" for c in final_module[:20])
-                original_filename = uploaded_file.name
-                file_extension = os.path.splitext(original_filename)[1]
-                unique_filename = f"{timestamp_str}_{safe_learner_name}_{safe_module_name}{file_extension}"
-                save_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-                with open(save_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-
-                submission_time = datetime.now()
-                add_submission_to_state(
-                    timestamp=submission_time, learner_name=learner_name, module_task=final_module,
-                    filename=original_filename, file_path=save_path, status="Submitted"
-                )
-
-                st.success(f"✅ Success! Your work '{original_filename}' for '{final_module}' has been submitted.")
-                st.balloons()
-                # No explicit rerun needed here due to form submission behavior
-
-            except Exception as e:
-                st.error(f"❌ An error occurred during submission: {e}")
-
-# --- Display Submitted Work & Chat ---
-st.divider()
-st.header("📋 Submission History & Feedback")
-st.markdown("_(Select a submission to view details, download the file, and add comments.)_")
-
-if not st.session_state.submissions_df.empty:
-    # Select submission
-    st.subheader("Select Submission")
-    
-    # Modified format_func to handle both datetime and string timestamps
-    def format_submission(x):
-        row = st.session_state.submissions_df.loc[x]
-        timestamp = row['Timestamp']
-        
-        # Format timestamp based on its type
-        if isinstance(timestamp, pd.Timestamp) or isinstance(timestamp, datetime):
-            formatted_time = timestamp.strftime('%Y-%m-%d %H:%M')
-        else:
-            # If it's still a string despite conversion attempts, just use it as is
-            formatted_time = timestamp
-            
-        return f"[{formatted_time}] {row['Learner Name']} - {row['Module/Task']} ({row['Status']})"
-    
-    selected_submission_index = st.selectbox(
-        "Select a submission:",
-        st.session_state.submissions_df.index,
-        format_func=format_submission,
-        index=None, # Default to no selection
-        placeholder="Choose a submission to view...",
-        key="submission_selector" # Add key for stability
-    )
-
-    if selected_submission_index is not None:
-        selected_row = st.session_state.submissions_df.loc[selected_submission_index]
-        file_path_to_download = selected_row['File Path']
-        original_filename = selected_row['Filename']
-
-        # Display details and download in columns
-        col1, col2 = st.columns([2,1]) # Give more space to details/preview
-
-        with col1:
-            st.subheader("Submission Details & Preview")
-            st.write(f"**Learner:** {selected_row['Learner Name']}")
-            st.write(f"**Module/Task:** {selected_row['Module/Task']}")
-            
-            # Display timestamp based on its type
-            timestamp = selected_row['Timestamp']
-            if isinstance(timestamp, pd.Timestamp) or isinstance(timestamp, datetime):
-                st.write(f"**Submitted:** {timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-            else:
-                st.write(f"**Submitted:** {timestamp}")
-                
-            st.write(f"**Status:** {selected_row['Status']}")
-            st.write(f"**Original Filename:** {original_filename}")
-
-            # Preview/Download button
-            try:
-                with open(file_path_to_download, "rb") as fp:
-                    st.download_button(
-                        label=f"Download '{original_filename}'",
-                        data=fp,
-                        file_name=original_filename,
-                        mime=None
-                    )
-                # Optional: Display image/video previews
-                file_ext = os.path.splitext(original_filename)[1].lower()
-                if file_ext in ['.png', '.jpg', '.jpeg', '.gif']:
-                    st.image(file_path_to_download, caption=f"Preview: {original_filename}", use_column_width=True)
-                elif file_ext in ['.mp4', '.mov', '.avi', '.webm']:
-                    st.video(file_path_to_download)
-                # Add more preview types if needed
-
-            except FileNotFoundError:
-                st.error(f"Error: File not found at path '{file_path_to_download}'. It might have been moved or deleted.")
-            except Exception as e:
-                st.error(f"An error occurred while preparing the download/preview: {e}")
-
-        with col2:
-            st.subheader("💬 Mentor Feedback / Chat")
-
-            # Display existing chat messages
-            chat_history = selected_row['Chat']
-            if isinstance(chat_history, list) and chat_history:
-                 # Use a container with height for scrollability
-                 with st.container(height=300):
-                    for msg in chat_history:
-                        st.markdown(f"**{msg.get('author', 'Unknown')}** ({msg.get('timestamp', '')}):\n{msg.get('message', '')}")
-                        st.divider()
-            else:
-                st.info("No comments yet for this submission.")
-
-            # Chat input form
-            # Use a unique key based on the index to avoid state issues when switching selections
-            with st.form(key=f"chat_form_{selected_submission_index}", clear_on_submit=True):
-                comment_author = st.text_input("Your Name (Mentor):", value="Mentor", key=f"author_{selected_submission_index}") # Placeholder name
-                comment_text = st.text_area("Add a comment:", key=f"comment_{selected_submission_index}")
-                submit_comment = st.form_submit_button("Send Comment")
-
-                if submit_comment and comment_text:
-                    add_chat_message(selected_submission_index, comment_author, comment_text)
-                    # Rerun to display the new message immediately
-                    st.rerun()
-                elif submit_comment and not comment_text:
-                    st.warning("Please enter a comment before sending.")
-
-    else:
-         st.info("Select a submission from the list above to see details and comments.")
-
-else:
-    st.info("No submissions recorded yet.")
-
-# --- Footer ---
-st.markdown("---")
+import streamlit as st
+import pandas as pd
+import os
+import re
+import uuid
+from datetime import datetime
+import json # Needed for handling chat data if saving to CSV (though not fully implemented here)
+
+# --- Configuration ---
+UPLOAD_DIR = "uploaded_work_samples" # Directory to save uploaded files
+SUBMISSIONS_FILE = "submissions.parquet" # File to store submission records
+LEGACY_SUBMISSIONS_FILE = "submissions.csv" # Old CSV store, read once for migration
+SUBMISSION_COLUMNS = [
+    "Submission ID", "Timestamp", "Learner Name", "Module/Task", "Filename", "File Path", "Status", "Chat"
+]
+# Compiled once; matches any character not safe for use in a filename
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9]')
+
+# --- Helper Functions ---
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_submissions():
+    """Loads the submissions file into a DataFrame.
+
+    Cached so that reruns (and new sessions) within the TTL skip the file
+    read and parsing entirely; save_submission_record clears the cache after
+    writing so the next load picks up fresh data.
+    """
+    try:
+        df = pd.read_parquet(SUBMISSIONS_FILE)
+        # Parquet stores Timestamp and Chat natively; just normalize the
+        # round-tripped list column back from arrays to plain lists.
+        if 'Chat' in df.columns:
+            df['Chat'] = df['Chat'].apply(lambda x: list(x) if x is not None else [])
+        else:
+            df['Chat'] = [[] for _ in range(len(df))]
+        return df
+    except FileNotFoundError:
+        pass
+
+    # Fall back to the legacy CSV store (migrated to Parquet on the next save)
+    df = pd.read_csv(LEGACY_SUBMISSIONS_FILE)
+    # Convert Timestamp column to datetime; pinning the format skips pandas'
+    # per-element format inference
+    if 'Timestamp' in df.columns:
+        df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='ISO8601')
+
+    # Ensure 'Chat' column exists and contains lists (handle potential loading issues)
+    if 'Chat' not in df.columns:
+        df['Chat'] = [[] for _ in range(len(df))]
+    else:
+        # Decode only the cells that hold a JSON list string, instead of
+        # running a conditional lambda over every row. This is still fragile;
+        # the Parquet store above avoids string round-tripping entirely.
+        # Work on an object-dtype copy: newer pandas infers a string dtype for
+        # the column, which rejects list values written into masked positions.
+        chat = df['Chat'].astype(object)
+        json_mask = chat.map(type).eq(str) & chat.str.startswith('[', na=False)
+        chat[json_mask] = chat[json_mask].map(json.loads)
+        # Anything that still isn't a list becomes an empty history
+        bad_mask = chat.map(type).ne(list)
+        chat[bad_mask] = pd.Series(
+            [[] for _ in range(int(bad_mask.sum()))], index=df.index[bad_mask], dtype=object
+        )
+        df['Chat'] = chat
+    return df
+
+
+def initialize_app():
+    """Initializes the application state and necessary directories/files."""
+    if not os.path.exists(UPLOAD_DIR):
+        try:
+            os.makedirs(UPLOAD_DIR)
+        except OSError as e:
+            st.error(f"Error creating upload directory: {e}")
+            st.stop()
+
+    if 'submission_records' not in st.session_state:
+        try:
+            # Keep submissions as a plain list of dicts: appending a new one is
+            # O(1) instead of re-copying a whole DataFrame via pd.concat.
+            st.session_state.submission_records = load_submissions().to_dict('records')
+        except FileNotFoundError:
+            st.session_state.submission_records = []
+        except (pd.errors.EmptyDataError, KeyError, json.JSONDecodeError) as e:
+             st.warning(f"Issue loading submissions or chat history ({e}), initializing fresh state.")
+             st.session_state.submission_records = []
+        except Exception as e:
+            st.error(f"Error loading submissions file: {e}")
+            st.session_state.submission_records = []
+
+        # Ensure every record has a stable id and a list-valued chat history.
+        # Ids from before this column existed (legacy CSV rows) are minted here
+        # and persist on the next save.
+        for record in st.session_state.submission_records:
+            if not record.get('Submission ID') or pd.isna(record.get('Submission ID')):
+                record['Submission ID'] = uuid.uuid4().hex
+            if not isinstance(record.get('Chat'), list):
+                record['Chat'] = []
+
+        # O(1) id -> record lookup; entries are references into the list above
+        st.session_state.submissions_by_id = {
+            record['Submission ID']: record for record in st.session_state.submission_records
+        }
+
+        # Cache-buster for derived data such as the selectbox labels
+        st.session_state.submission_epoch = 0
+
+
+def get_submissions_df():
+    """Materializes the session submission records into a DataFrame."""
+    return pd.DataFrame(st.session_state.submission_records, columns=SUBMISSION_COLUMNS)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def compute_submission_labels(_records, epoch, record_count):
+    """Builds the selectbox label for every submission in one vectorized pass.
+
+    A single set of pandas string operations replaces calling a Python
+    format_func (isinstance checks + strftime) once per row per rerun. The
+    records themselves are excluded from the cache key (leading underscore);
+    the epoch counter, bumped on every new submission, keys the cache so
+    reruns that don't change the dataset reuse the previous labels. The
+    record count is part of the key too: the cache is shared across sessions
+    while the epoch is session-local, so without it a session could be served
+    another session's shorter label list and index past its end.
+    """
+    df = pd.DataFrame(_records, columns=SUBMISSION_COLUMNS)
+    timestamps = pd.to_datetime(df['Timestamp'], errors='coerce')
+    # Fall back to the raw value for anything that didn't parse as a datetime
+    formatted_times = timestamps.dt.strftime('%Y-%m-%d %H:%M').fillna(df['Timestamp'].astype(str))
+    labels = (
+        '[' + formatted_times + '] ' + df['Learner Name'].astype(str)
+        + ' - ' + df['Module/Task'].astype(str)
+        + ' (' + df['Status'].astype(str) + ')'
+    )
+    return labels.tolist()
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def read_file_bytes(path):
+    """Reads an uploaded work sample into memory for the download button.
+
+    Cached so that reruns (every widget interaction while a submission is
+    selected) don't re-read a potentially large file from disk each time.
+    """
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+def save_submission_record(df):
+    """Saves the submission DataFrame (chat history included) to Parquet."""
+    try:
+        # Parquet stores the list-valued 'Chat' column natively, so no columns
+        # need to be dropped and chat history survives restarts.
+        df.to_parquet(SUBMISSIONS_FILE, index=False)
+        # Invalidate the cached loader so the next load reflects this write
+        load_submissions.clear()
+    except Exception as e:
+        st.error(f"Error saving submission record to Parquet: {e}")
+
+def add_submission_to_state(timestamp, learner_name, module_task, filename, file_path, status="Submitted"):
+    """Adds a new submission to the session state records."""
+    record = {
+        "Submission ID": uuid.uuid4().hex, # Stable key, unlike a list position
+        "Timestamp": timestamp,
+        "Learner Name": learner_name,
+        "Module/Task": module_task,
+        "Filename": filename,
+        "File Path": file_path,
+        "Status": status,
+        "Chat": [] # Initialize chat history as an empty list
+    }
+    st.session_state.submission_records.append(record)
+    st.session_state.submissions_by_id[record['Submission ID']] = record
+    # Invalidate derived data (e.g. cached selectbox labels)
+    st.session_state.submission_epoch += 1
+    # Save the updated records to disk
+    save_submission_record(get_submissions_df())
+
+
+def add_chat_message(submission_id, author, message):
+    """Adds a chat message to a specific submission in the session state."""
+    record = st.session_state.submissions_by_id.get(submission_id)
+    if record is not None:
+        message_entry = {
+            "author": author,
+            "message": message,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        # Append message to the record's list — O(1), no DataFrame lookup
+        record['Chat'].append(message_entry)
+        # This change is only in session state, not saved to disk by default.
+    else:
+        st.error("Could not add chat message: Unknown submission id.")
+
+
+# --- Streamlit App UI ---
+
+st.set_page_config(layout="wide")
+st.title("🎓 Work Sample Submission Portal")
+st.markdown("Upload your work samples here for progress verification.")
+
+initialize_app()
+
+# --- Submission Form ---
+st.header("Submit Your Work")
+with st.form("submission_form", clear_on_submit=True):
+    learner_name = st.text_input("Enter Your Name:")
+    available_modules = [
+        "Module 1: Basic Wood Carving Techniques", "Module 2: Introduction to Pottery Wheel",
+        "Task 3.1: Soldering Practice", "Project Alpha: Weaving Pattern Design",
+        "Cultural Practice: Traditional Knot Tying - Step 1", "Other"
+    ]
+    selected_module_option = st.selectbox("Select the Module/Task:", available_modules)
+    custom_module = ""
+    if selected_module_option == "Other":
+        custom_module = st.text_input("Please specify the Module/Task:")
+
+    uploaded_file = st.file_uploader(
+        "Upload your work sample (Image, Video, PDF, etc.):",
+        type=None
+    )
+    submitted = st.form_submit_button("Submit Work Sample")
+
+    if submitted:
+        final_module = custom_module if selected_module_option == "Other" else selected_module_option
+        if not learner_name:
+            st.warning("Please enter your name.")
+        elif not final_module:
+            st.warning("Please select or specify the module/task.")
+        elif uploaded_file is None:
+            st.warning("Please upload a file.")
+        else:
+            try:
+                timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+                safe_learner_name = _UNSAFE_FILENAME_CHARS.sub("_", learner_name)
+                safe_module_name = _UNSAFE_FILENAME_CHARS.sub("_", final_module[:20])
+                original_filename = uploaded_file.name
+                file_extension = os.path.splitext(original_filename)[1]
+                unique_filename = f"{timestamp_str}_{safe_learner_name}_{safe_module_name}{file_extension}"
+                save_path = os.path.join(UPLOAD_DIR, unique_filename)
+
+                with open(save_path, "wb") as f:
+                    f.write(uploaded_file.getbuffer())
+
+                submission_time = datetime.now()
+                add_submission_to_state(
+                    timestamp=submission_time, learner_name=learner_name, module_task=final_module,
+                    filename=original_filename, file_path=save_path, status="Submitted"
+                )
+
+                st.success(f"✅ Success! Your work '{original_filename}' for '{final_module}' has been submitted.")
+                st.balloons()
+                # No explicit rerun needed here due to form submission behavior
+
+            except Exception as e:
+                st.error(f"❌ An error occurred during submission: {e}")
+
+# --- Display Submitted Work & Chat ---
+st.divider()
+st.header("📋 Submission History & Feedback")
+st.markdown("_(Select a submission to view details, download the file, and add comments.)_")
+
+if st.session_state.submission_records:
+    # Select submission
+    st.subheader("Select Submission")
+
+    # Labels are precomputed in one vectorized pass; the format_func is a
+    # plain O(1) list lookup instead of per-row formatting on every rerun.
+    submission_labels = compute_submission_labels(
+        st.session_state.submission_records,
+        st.session_state.submission_epoch,
+        len(st.session_state.submission_records)
+    )
+
+    selected_submission_index = st.selectbox(
+        "Select a submission:",
+        range(len(st.session_state.submission_records)),
+        format_func=lambda i: submission_labels[i],
+        index=None, # Default to no selection
+        placeholder="Choose a submission to view...",
+        key="submission_selector" # Add key for stability
+    )
+
+    # Scoped as a fragment so sending a comment reruns only this pane,
+    # not the submission form and selectbox above it.
+    @st.fragment
+    def render_submission_details(submission_id):
+        selected_row = st.session_state.submissions_by_id[submission_id]
+        file_path_to_download = selected_row['File Path']
+        original_filename = selected_row['Filename']
+
+        # Display details and download in columns
+        col1, col2 = st.columns([2,1]) # Give more space to details/preview
+
+        with col1:
+            st.subheader("Submission Details & Preview")
+            st.write(f"**Learner:** {selected_row['Learner Name']}")
+            st.write(f"**Module/Task:** {selected_row['Module/Task']}")
+            
+            # Display timestamp based on its type
+            timestamp = selected_row['Timestamp']
+            if isinstance(timestamp, pd.Timestamp) or isinstance(timestamp, datetime):
+                st.write(f"**Submitted:** {timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+            else:
+                st.write(f"**Submitted:** {timestamp}")
+                
+            st.write(f"**Status:** {selected_row['Status']}")
+            st.write(f"**Original Filename:** {original_filename}")
+
+            # Preview/Download button
+            try:
+                st.download_button(
+                    label=f"Download '{original_filename}'",
+                    data=read_file_bytes(file_path_to_download),
+                    file_name=original_filename,
+                    mime=None
+                )
+                # Optional: Display image/video previews
+                file_ext = os.path.splitext(original_filename)[1].lower()
+                if file_ext in ['.png', '.jpg', '.jpeg', '.gif']:
+                    st.image(file_path_to_download, caption=f"Preview: {original_filename}", use_column_width=True)
+                elif file_ext in ['.mp4', '.mov', '.avi', '.webm']:
+                    st.video(file_path_to_download)
+                # Add more preview types if needed
+
+            except FileNotFoundError:
+                st.error(f"Error: File not found at path '{file_path_to_download}'. It might have been moved or deleted.")
+            except Exception as e:
+                st.error(f"An error occurred while preparing the download/preview: {e}")
+
+        with col2:
+            st.subheader("💬 Mentor Feedback / Chat")
+
+            # Display existing chat messages
+            chat_history = selected_row['Chat']
+            if isinstance(chat_history, list) and chat_history:
+                 # Use a container with height for scrollability
+                 with st.container(height=300):
+                    for msg in chat_history:
+                        st.markdown(f"**{msg.get('author', 'Unknown')}** ({msg.get('timestamp', '')}):\n{msg.get('message', '')}")
+                        st.divider()
+            else:
+                st.info("No comments yet for this submission.")
+
+            # Chat input form
+            # Use a unique key based on the submission id to avoid state issues when switching selections
+            with st.form(key=f"chat_form_{submission_id}", clear_on_submit=True):
+                comment_author = st.text_input("Your Name (Mentor):", value="Mentor", key=f"author_{submission_id}") # Placeholder name
+                comment_text = st.text_area("Add a comment:", key=f"comment_{submission_id}")
+                submit_comment = st.form_submit_button("Send Comment")
+
+                if submit_comment and comment_text:
+                    add_chat_message(submission_id, comment_author, comment_text)
+                    # Rerun just this fragment to display the new message
+                    st.rerun(scope="fragment")
+                elif submit_comment and not comment_text:
+                    st.warning("Please enter a comment before sending.")
+
+    if selected_submission_index is not None:
+        render_submission_details(
+            st.session_state.submission_records[selected_submission_index]['Submission ID']
+        )
+
+    else:
+         st.info("Select a submission from the list above to see details and comments.")
+
+else:
+    st.info("No submissions recorded yet.")
+
+# --- Footer ---
+st.markdown("---")
 st.caption("Cross-Generation Knowledge Transfer Platform")
\ No newline at end of file